@@ -30,7 +30,15 @@ from googleapiclient.http import build_http
 
 
 def init(
-    argv, name, version, doc, filename, scope=None, parents=[], discovery_filename=None
+    argv,
+    name,
+    version,
+    doc,
+    filename,
+    scope=None,
+    parents=[],
+    discovery_filename=None,
+    model=None,
 ):
     """A common initialization routine for samples.
 
@@ -50,6 +58,8 @@ def init(
     parents: list of argparse.ArgumentParser, additional command-line flags.
     scope: string, The OAuth scope used.
     discovery_filename: string, name of local discovery file (JSON). Use when discovery doc not available via URL.
+    model: googleapiclient.model.Model, converts to and from the wire format.
+      Defaults to the JSON model chosen by the discovery document.
 
   Returns:
     A tuple of (service, flags), where service is the service object and flags
@@ -100,11 +110,14 @@ def init(
 
     if discovery_filename is None:
         # Construct a service object via the discovery service.
-        service = discovery.build(name, version, http=http)
+        service = discovery.build(name, version, http=http, model=model)
     else:
         # Construct a service object using a local discovery document file.
         with open(discovery_filename) as discovery_file:
             service = discovery.build_from_document(
-                discovery_file.read(), base="https://www.googleapis.com/", http=http
+                discovery_file.read(),
+                base="https://www.googleapis.com/",
+                http=http,
+                model=model,
             )
     return (service, flags)
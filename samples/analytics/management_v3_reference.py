@@ -26,7 +26,9 @@ Google Analytics Management hiearchy. It first retrieves and prints all the
 authorized user's accounts, next it prints all the web properties for the
 first account, then all the profiles for the first web property and finally
 all the goals for the first profile. The sample then prints all the
-user's advanced segments.
+user's advanced segments, which do not depend on the accounts hiearchy and
+are therefore retrieved in the same batch request as the accounts. Every
+result page of each collection is printed.
 
 
 Before You Begin:
@@ -55,22 +57,122 @@ from __future__ import print_function
 __author__ = 'api.nickm@gmail.com (Nick Mihailovski)'
 
 import argparse
+import asyncio
+import concurrent.futures
+import copy
+import datetime
+import functools
 import sys
+import threading
+import urllib.parse
 
-from googleapiclient.errors import HttpError
-from googleapiclient import sample_tools
-from oauth2client.client import AccessTokenRefreshError
+# The client library and oauth2client are imported inside the functions that
+# use them, so that loading this module only imports the standard library.
+
+
+def positive_int(value):
+  """Parses a command-line flag that must be an integer of at least 1.
+
+  Args:
+    value: string, the value of the flag.
+
+  Returns:
+    The value as an int.
+
+  Raises:
+    argparse.ArgumentTypeError: If value is not an integer of at least 1.
+  """
+
+  try:
+    number = int(value)
+  except ValueError:
+    raise argparse.ArgumentTypeError('invalid int value: %r' % value)
+  if number < 1:
+    raise argparse.ArgumentTypeError('must be at least 1: %r' % value)
+  return number
+
+
+# Declare command-line flags.
+argparser = argparse.ArgumentParser(add_help=False)
+argparser.add_argument(
+    '--max_concurrent_requests', type=positive_int, default=5,
+    help='The maximum number of API requests in flight at once.')
+
+# Number of times a request is retried, with randomized exponential backoff,
+# after a rate limit or server error.
+NUM_RETRIES = 6
+
+# The maximum number of requests sent in a single batch HTTP request.
+MAX_BATCH_SIZE = 5
+
+# Per worker thread state, holding the Http object of the thread.
+THREAD_STATE = threading.local()
+
+# Stored access tokens that expire within this window are refreshed before the
+# traversal starts.
+TOKEN_EXPIRY_BUFFER = datetime.timedelta(seconds=45)
+
+# Partial response selectors that limit each collection to the fields printed
+# by this sample. The pagination fields are also needed to request the
+# following pages.
+PAGINATION_FIELDS = 'itemsPerPage,totalResults,startIndex,previousLink,nextLink'
+ACCOUNT_FIELDS = (
+    PAGINATION_FIELDS +
+    ',items(id,kind,selfLink,name,created,updated,childLink)')
+WEBPROPERTY_FIELDS = (
+    PAGINATION_FIELDS +
+    ',items(kind,accountId,id,internalWebPropertyId,websiteUrl,created,'
+    'updated,selfLink,parentLink,childLink)')
+PROFILE_FIELDS = (
+    PAGINATION_FIELDS +
+    ',items(kind,accountId,webPropertyId,internalWebPropertyId,id,name,'
+    'currency,timezone,defaultPage,excludeQueryParameters,'
+    'siteSearchCategoryParameters,siteSearchQueryParameters,created,updated,'
+    'selfLink,parentLink,childLink)')
+GOAL_FIELDS = (
+    PAGINATION_FIELDS +
+    ',items(id,kind,selfLink,accountId,webPropertyId,internalWebPropertyId,'
+    'profileId,name,value,active,type,created,updated,parentLink,'
+    'urlDestinationDetails,visitTimeOnSiteDetails,visitNumPagesDetails,'
+    'eventDetails)')
+SEGMENT_FIELDS = (
+    PAGINATION_FIELDS +
+    ',items(id,kind,selfLink,name,definition,created,updated)')
 
 
 def main(argv):
+  from googleapiclient import _auth
+  from googleapiclient.errors import HttpError
+  from googleapiclient import sample_tools
+  from oauth2client.client import AccessTokenRefreshError
+
   # Authenticate and construct service.
   service, flags = sample_tools.init(
       argv, 'analytics', 'v3', __doc__, __file__,
-      scope='https://www.googleapis.com/auth/analytics.readonly')
+      scope='https://www.googleapis.com/auth/analytics.readonly',
+      parents=[argparser], model=orjson_model())
+
+  # Reuse the credentials the service was authorized with, so that batch
+  # requests, which are signed by the service's Http object, and the requests
+  # of every worker thread share a single access token.
+  credentials = _auth.get_credentials_from_http(service._http)
 
   # Traverse the Management hiearchy and print results or handle errors.
   try:
-    traverse_hiearchy(service)
+    refresh_expiring_token(credentials)
+
+    # Every request runs on the default executor, so the size of its thread
+    # pool bounds how many requests are in flight at once.
+    executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=flags.max_concurrent_requests)
+    loop = asyncio.new_event_loop()
+    loop.set_default_executor(executor)
+    try:
+      loop.run_until_complete(traverse_hiearchy(service, credentials))
+    finally:
+      loop.run_until_complete(loop.shutdown_asyncgens())
+      loop.close()
+      executor.shutdown()
 
   except TypeError as error:
     # Handle errors in constructing a query.
@@ -86,219 +188,642 @@ def main(argv):
            'the application to re-authorize')
 
 
-def traverse_hiearchy(service):
+def orjson_model():
+  """Creates a JsonModel that parses response bodies with orjson.
+
+  Returns:
+    An OrjsonModel, or None if orjson is not installed.
+  """
+
+  try:
+    import orjson
+  except ImportError:
+    return None
+
+  return orjson_model_class()()
+
+
+@functools.lru_cache(maxsize=None)
+def orjson_model_class():
+  """Defines OrjsonModel the first time it is needed.
+
+  The client library and orjson are only imported once --help has been handled,
+  so the class is created here rather than at module level.
+
+  Returns:
+    The OrjsonModel class.
+  """
+
+  import orjson
+  from googleapiclient.model import JsonModel
+
+  class OrjsonModel(JsonModel):
+    """JsonModel that parses response bodies with orjson.
+
+    orjson decodes JSON noticeably faster than the json module and produces the
+    same Python objects, so it is used when it is installed.
+    """
+
+    def deserialize(self, content):
+      body = orjson.loads(content)
+      if self._data_wrapper and isinstance(body, dict) and 'data' in body:
+        body = body['data']
+      return body
+
+  return OrjsonModel
+
+
+def refresh_expiring_token(credentials):
+  """Refreshes the access token if it has expired or is about to expire.
+
+  oauth2client only refreshes a stored token once a request using it has been
+  rejected with a 401, which costs a wasted round trip for every request that
+  is already in flight. Refreshing up front avoids that. The refreshed token
+  is written back to the credentials file, so later runs reuse it until it
+  expires.
+
+  Args:
+    credentials: The OAuth 2.0 credentials the service was authorized with.
+  """
+
+  from googleapiclient.http import build_http
+
+  expiry = credentials.token_expiry
+  if expiry and datetime.datetime.utcnow() + TOKEN_EXPIRY_BUFFER >= expiry:
+    credentials.refresh(build_http())
+
+
+async def traverse_hiearchy(service, credentials):
   """Traverses the management API hiearchy and prints results.
 
   This retrieves and prints the authorized user's accounts. It then
   retrieves and prints all the web properties for the first account,
   retrieves and prints all the profiles for the first web property,
-  and retrieves and prints all the goals for the first profile.
+  and retrieves and prints all the goals for the first profile. The segments
+  are retrieved in the same batch request as the accounts and printed last.
 
   Args:
     service: The service object built by the Google API Python client library.
+    credentials: The OAuth 2.0 credentials used to authorize each request.
 
   Raises:
     HttpError: If an error occurred when accessing the API.
     AccessTokenRefreshError: If the current token was invalid.
   """
 
-  accounts = service.management().accounts().list().execute()
-  print_accounts(accounts)
-
-  if accounts.get('items'):
-    firstAccountId = accounts.get('items')[0].get('id')
-    webproperties = service.management().webproperties().list(
-        accountId=firstAccountId).execute()
-
-    print_webproperties(webproperties)
-
-    if webproperties.get('items'):
-      firstWebpropertyId = webproperties.get('items')[0].get('id')
-      profiles = service.management().profiles().list(
+  # Resolve the collection resources once instead of rebuilding the Resource
+  # chain for every request.
+  management = service.management()
+  accounts_api = management.accounts()
+  webproperties_api = management.webproperties()
+  profiles_api = management.profiles()
+  goals_api = management.goals()
+  segments_api = management.segments()
+
+  accounts_request = accounts_api.list(fields=ACCOUNT_FIELDS)
+  segments_request = segments_api.list(fields=SEGMENT_FIELDS)
+  accounts, segments = await execute_batch(
+      service, [accounts_request, segments_request], credentials)
+
+  # Requests started ahead of time. Any that are still outstanding when the
+  # traversal stops, e.g. because of an HttpError, are cancelled.
+  prefetches = []
+  try:
+    # Each remaining level depends on the first ID returned by the previous one.
+    # Its request is started as soon as that ID is known, so that it is fetched
+    # while the previous level is being printed.
+    webproperties = None
+    account_items = accounts.get('items')
+    if account_items:
+      firstAccountId = account_items[0].get('id')
+      webproperties_request = webproperties_api.list(
           accountId=firstAccountId,
-          webPropertyId=firstWebpropertyId).execute()
+          fields=WEBPROPERTY_FIELDS)
+      webproperties = start_request(webproperties_request, credentials)
+      prefetches.append(webproperties)
 
-      print_profiles(profiles)
+    await print_pages(print_accounts, accounts_request, accounts, credentials)
 
-      if profiles.get('items'):
-        firstProfileId = profiles.get('items')[0].get('id')
-        goals = service.management().goals().list(
+    if webproperties is not None:
+      webproperties = await webproperties
+
+      profiles = None
+      webproperty_items = webproperties.get('items')
+      if webproperty_items:
+        firstWebpropertyId = webproperty_items[0].get('id')
+        profiles_request = profiles_api.list(
             accountId=firstAccountId,
             webPropertyId=firstWebpropertyId,
-            profileId=firstProfileId).execute()
+            fields=PROFILE_FIELDS)
+        profiles = start_request(profiles_request, credentials)
+        prefetches.append(profiles)
 
-        print_goals(goals)
+      await print_pages(print_webproperties, webproperties_request,
+                        webproperties, credentials)
 
-  print_segments(service.management().segments().list().execute())
+      if profiles is not None:
+        profiles = await profiles
 
+        goals = None
+        profile_items = profiles.get('items')
+        if profile_items:
+          firstProfileId = profile_items[0].get('id')
+          goals_request = goals_api.list(
+              accountId=firstAccountId,
+              webPropertyId=firstWebpropertyId,
+              profileId=firstProfileId,
+              fields=GOAL_FIELDS)
+          goals = start_request(goals_request, credentials)
+          prefetches.append(goals)
 
-def print_accounts(accounts_response):
-  """Prints all the account info in the Accounts Collection.
+        await print_pages(print_profiles, profiles_request, profiles,
+                          credentials)
+
+        if goals is not None:
+          await print_pages(print_goals, goals_request, await goals,
+                            credentials)
+
+    await print_pages(print_segments, segments_request, segments, credentials)
+
+  finally:
+    await cancel_pending(prefetches)
+
+
+async def print_pages(print_collection, request, response, credentials):
+  """Prints a response and every later page of its collection.
 
   Args:
-    accounts_response: The response object returned from querying the Accounts
+    print_collection: The coroutine function that prints the pages of the
         collection.
+    request: The googleapiclient.http.HttpRequest that returned response.
+    response: The first page of the collection.
+    credentials: The OAuth 2.0 credentials used to authorize each request.
+  """
+
+  pages = iter_pages(request, response, credentials)
+  try:
+    await print_collection(pages)
+  finally:
+    await pages.aclose()
+
+
+async def iter_pages(request, response, credentials):
+  """Yields a response followed by every later page of its collection.
+
+  The request for the next page is started before the current page is
+  yielded, so it is fetched while the caller prints the current page.
+
+  Args:
+    request: The googleapiclient.http.HttpRequest that returned response.
+    response: The first page of the collection.
+    credentials: The OAuth 2.0 credentials used to authorize each request.
+
+  Yields:
+    Each page of the collection, starting with response.
+  """
+
+  next_page = None
+  try:
+    while response is not None:
+      request = list_next(request, response)
+      next_page = None
+      if request is not None:
+        next_page = start_request(request, credentials)
+
+      yield response
+
+      response = await next_page if next_page is not None else None
+  finally:
+    if next_page is not None:
+      await cancel_pending([next_page])
+
+
+def list_next(previous_request, previous_response):
+  """Creates the request for the page following previous_response.
+
+  The Management API pages through collections with start-index rather than
+  page tokens, so the client library does not generate list_next() methods
+  for them.
+
+  Args:
+    previous_request: The request for the previous page.
+    previous_response: The response from the request for the previous page.
+
+  Returns:
+    A request object for the next page, or None if there are no more pages.
+  """
+
+  if not previous_response.get('nextLink'):
+    return None
+
+  start_index = (previous_response.get('startIndex') +
+                 previous_response.get('itemsPerPage'))
+
+  parsed = list(urllib.parse.urlparse(previous_request.uri))
+  query = dict(urllib.parse.parse_qsl(parsed[4]))
+  query['start-index'] = start_index
+  parsed[4] = urllib.parse.urlencode(query)
+
+  request = copy.copy(previous_request)
+  request.uri = urllib.parse.urlunparse(parsed)
+  return request
+
+
+async def execute_batch(service, requests, credentials):
+  """Executes independent requests as batch HTTP requests.
+
+  The requests are split into batches of at most MAX_BATCH_SIZE, which are
+  sent one after the other. batch.execute() has no retry support, so any
+  request that failed inside a batch, as well as every request of a batch that
+  was itself rejected with an error that single requests would retry, such as a
+  rate limit or server error, is sent again on its own. Those requests are sent
+  concurrently, and each is retried with exponential backoff.
+
+  Args:
+    service: The service object built by the Google API Python client library.
+    requests: A list of googleapiclient.http.HttpRequest objects.
+    credentials: The OAuth 2.0 credentials used to authorize the batches.
+
+  Returns:
+    A list with the deserialized response of each request, in the same order
+    as requests.
+
+  Raises:
+    HttpError: If any of the requests still failed after being retried.
+  """
+
+  from googleapiclient.errors import HttpError
+  from googleapiclient.http import _should_retry_response
+
+  responses = {}
+  failed = []
+
+  def on_response(request_id, response, exception):
+    if exception is not None:
+      failed.append(request_id)
+    responses[request_id] = response
+
+  for start in range(0, len(requests), MAX_BATCH_SIZE):
+    batch = service.new_batch_http_request(callback=on_response)
+    request_ids = [
+        str(index)
+        for index in range(start, min(start + MAX_BATCH_SIZE, len(requests)))]
+    for request_id in request_ids:
+      batch.add(requests[int(request_id)], request_id=request_id)
+
+    try:
+      await run_with_http(batch.execute, credentials)
+    except HttpError as error:
+      if not _should_retry_response(error.resp.status, error.content):
+        raise
+      failed.extend(request_ids)
+
+  retries = [
+      start_request(requests[int(request_id)], credentials)
+      for request_id in failed]
+  try:
+    for request_id, response in zip(failed, await asyncio.gather(*retries)):
+      responses[request_id] = response
+  finally:
+    await cancel_pending(retries)
+
+  return [responses[str(index)] for index in range(len(requests))]
+
+
+async def cancel_pending(futures):
+  """Cancels the futures that have not finished and waits for them to settle.
+
+  Cancelling a request that is already running on a worker thread cannot stop
+  it, but it keeps requests that have not started yet from being sent, and
+  waiting here makes sure no task is left pending when the event loop closes.
+
+  Args:
+    futures: A list of asyncio futures returned by start_request.
+  """
+
+  for future in futures:
+    future.cancel()
+  await asyncio.gather(*futures, return_exceptions=True)
+
+
+def start_request(request, credentials):
+  """Starts executing a request in the background.
+
+  Args:
+    request: The googleapiclient.http.HttpRequest to execute.
+    credentials: The OAuth 2.0 credentials used to authorize the request.
+
+  Returns:
+    An asyncio.Future that resolves to the deserialized response.
+  """
+
+  return asyncio.ensure_future(execute_request(request, credentials))
+
+
+async def execute_request(request, credentials):
+  """Executes a request, retrying rate limit and server errors.
+
+  Args:
+    request: The googleapiclient.http.HttpRequest to execute.
+    credentials: The OAuth 2.0 credentials used to authorize the request.
+
+  Returns:
+    The deserialized response.
+  """
+
+  return await run_with_http(
+      functools.partial(request.execute, num_retries=NUM_RETRIES), credentials)
+
+
+async def run_with_http(execute, credentials):
+  """Calls execute in the default executor and returns its result.
+
+  The client library is synchronous, so the blocking call runs on a worker
+  thread, using that thread's authorized Http object.
+
+  Args:
+    execute: A callable that accepts an http keyword argument, such as the
+        execute method of a request or batch request.
+    credentials: The OAuth 2.0 credentials used to authorize the call.
+
+  Returns:
+    The value returned by execute.
+  """
+
+  def call():
+    return execute(http=thread_http(credentials))
+
+  loop = asyncio.get_event_loop()
+  return await loop.run_in_executor(None, call)
+
+
+def thread_http(credentials):
+  """Returns the authorized Http object of the current thread.
+
+  httplib2.Http objects are not thread-safe, so they cannot be shared between
+  worker threads. They do keep their connections alive between requests
+  though, so each worker thread reuses a single Http object rather than
+  opening a new connection, and TLS session, for every request.
+
+  Args:
+    credentials: The OAuth 2.0 credentials the service was authorized with.
+        Sharing them keeps every thread on the same access token as the
+        service's own Http object, which signs batch requests.
+
+  Returns:
+    An authorized httplib2.Http object owned by the current thread.
+  """
+
+  http = getattr(THREAD_STATE, 'http', None)
+  if http is None:
+    from googleapiclient.http import build_http
+
+    http = credentials.authorize(build_http())
+    THREAD_STATE.http = http
+  return http
+
+
+# Output templates for the printers, formatted with str.format_map() against
+# the fields of a single item.
+ACCOUNT_TEMPLATE = (
+    'Account ID      = {id}\n'
+    'Kind            = {kind}\n'
+    'Self Link       = {selfLink}\n'
+    'Account Name    = {name}\n'
+    'Created         = {created}\n'
+    'Updated         = {updated}\n'
+    'Child link href = {childLink[href]}\n'
+    'Child link type = {childLink[type]}\n'
+    '\n')
+
+WEBPROPERTY_TEMPLATE = (
+    'Kind               = {kind}\n'
+    'Account ID         = {accountId}\n'
+    'Web Property ID    = {id}\n'
+    'Internal Web Property ID = {internalWebPropertyId}\n'
+    'Website URL        = {websiteUrl}\n'
+    'Created            = {created}\n'
+    'Updated            = {updated}\n'
+    'Self Link          = {selfLink}\n'
+    'Parent link href   = {parentLink[href]}\n'
+    'Parent link type   = {parentLink[type]}\n'
+    'Child link href    = {childLink[href]}\n'
+    'Child link type    = {childLink[type]}\n'
+    '\n')
+
+PROFILE_TEMPLATE = (
+    'Kind                      = {kind}\n'
+    'Account ID                = {accountId}\n'
+    'Web Property ID           = {webPropertyId}\n'
+    'Internal Web Property ID = {internalWebPropertyId}\n'
+    'Profile ID                = {id}\n'
+    'Profile Name              = {name}\n'
+    'Currency         = {currency}\n'
+    'Timezone         = {timezone}\n'
+    'Default Page     = {defaultPage}\n'
+    'Exclude Query Parameters        = {excludeQueryParameters}\n'
+    'Site Search Category Parameters = {siteSearchCategoryParameters}\n'
+    'Site Search Query Parameters    = {siteSearchQueryParameters}\n'
+    'Created          = {created}\n'
+    'Updated          = {updated}\n'
+    'Self Link        = {selfLink}\n'
+    'Parent link href = {parentLink[href]}\n'
+    'Parent link type = {parentLink[type]}\n'
+    'Child link href  = {childLink[href]}\n'
+    'Child link type  = {childLink[type]}\n'
+    '\n')
+
+GOAL_TEMPLATE = (
+    'Goal ID     = {id}\n'
+    'Kind        = {kind}\n'
+    'Self Link        = {selfLink}\n'
+    'Account ID               = {accountId}\n'
+    'Web Property ID          = {webPropertyId}\n'
+    'Internal Web Property ID = {internalWebPropertyId}\n'
+    'Profile ID               = {profileId}\n'
+    'Goal Name   = {name}\n'
+    'Goal Value  = {value}\n'
+    'Goal Active = {active}\n'
+    'Goal Type   = {type}\n'
+    'Created     = {created}\n'
+    'Updated     = {updated}\n'
+    'Parent link href = {parentLink[href]}\n'
+    'Parent link type = {parentLink[type]}\n')
+
+URL_DESTINATION_GOAL_TEMPLATE = (
+    '------ Url Destination Goal -------\n'
+    'Goal URL            = {url}\n'
+    'Case Sensitive      = {caseSensitive}\n'
+    'Match Type          = {matchType}\n'
+    'First Step Required = {firstStepRequired}\n'
+    '------ Url Destination Goal Steps -------\n')
+
+GOAL_STEP_TEMPLATE = (
+    'Step Number  = {number}\n'
+    'Step Name    = {name}\n'
+    'Step URL     = {url}\n')
+
+VISIT_TIME_ON_SITE_GOAL_TEMPLATE = (
+    '------ Visit Time On Site Goal -------\n'
+    'Comparison Type  = {comparisonType}\n'
+    'comparison Value = {comparisonValue}\n')
+
+VISIT_NUM_PAGES_GOAL_TEMPLATE = (
+    '------ Visit Num Pages Goal -------\n'
+    'Comparison Type  = {comparisonType}\n'
+    'comparison Value = {comparisonValue}\n')
+
+EVENT_GOAL_TEMPLATE = (
+    '------ Event Goal -------\n'
+    'Use Event Value  = {useEventValue}\n')
+
+EVENT_CONDITION_MATCH_TEMPLATE = (
+    'Type             = {type}\n'
+    'Match Type       = {matchType}\n'
+    'Expression       = {expression}\n')
+
+EVENT_CONDITION_VALUE_TEMPLATE = (
+    'Type             = {type}\n'
+    'Comparison Type  = {comparisonType}\n'
+    'Comparison Value = {comparisonValue}\n')
+
+SEGMENT_TEMPLATE = (
+    'Segment ID = {id}\n'
+    'Kind       = {kind}\n'
+    'Self Link  = {selfLink}\n'
+    'Name       = {name}\n'
+    'Definition = {definition}\n'
+    'Created    = {created}\n'
+    'Updated    = {updated}\n'
+    '\n')
+
+
+class TemplateFields(dict):
+  """Fields of an item for str.format_map(), where missing fields are None."""
+
+  def __missing__(self, key):
+    return None
+
+
+def template_fields(item):
+  """Wraps an item, and its parent and child links, in TemplateFields.
+
+  Args:
+    item: A resource from one of the Management API collections.
+
+  Returns:
+    A TemplateFields mapping that can be passed to the output templates.
+  """
+
+  fields = TemplateFields(item)
+  fields['parentLink'] = TemplateFields(item.get('parentLink') or {})
+  fields['childLink'] = TemplateFields(item.get('childLink') or {})
+  return fields
+
+
+async def print_accounts(pages):
+  """Prints all the account info in the Accounts Collection.
+
+  Args:
+    pages: An async iterable of the response objects returned from querying
+        the Accounts collection, one per page.
   """
 
   print('------ Account Collection -------')
-  print_pagination_info(accounts_response)
-  print()
-
-  for account in accounts_response.get('items', []):
-    print('Account ID      = %s' % account.get('id'))
-    print('Kind            = %s' % account.get('kind'))
-    print('Self Link       = %s' % account.get('selfLink'))
-    print('Account Name    = %s' % account.get('name'))
-    print('Created         = %s' % account.get('created'))
-    print('Updated         = %s' % account.get('updated'))
-
-    child_link = account.get('childLink')
-    print('Child link href = %s' % child_link.get('href'))
-    print('Child link type = %s' % child_link.get('type'))
+
+  found = False
+  async for accounts_response in pages:
+    print_pagination_info(accounts_response)
     print()
 
-  if not accounts_response.get('items'):
+    items = accounts_response.get('items') or []
+    for account in items:
+      sys.stdout.write(ACCOUNT_TEMPLATE.format_map(template_fields(account)))
+    found = found or bool(items)
+
+  if not found:
     print('No accounts found.\n')
 
 
-def print_webproperties(webproperties_response):
+async def print_webproperties(pages):
   """Prints all the web property info in the WebProperties collection.
 
   Args:
-    webproperties_response: The response object returned from querying the
-        Webproperties collection.
+    pages: An async iterable of the response objects returned from querying
+        the Webproperties collection, one per page.
   """
 
   print('------ Web Properties Collection -------')
-  print_pagination_info(webproperties_response)
-  print()
-
-  for webproperty in webproperties_response.get('items', []):
-    print('Kind               = %s' % webproperty.get('kind'))
-    print('Account ID         = %s' % webproperty.get('accountId'))
-    print('Web Property ID    = %s' % webproperty.get('id'))
-    print(('Internal Web Property ID = %s' %
-           webproperty.get('internalWebPropertyId')))
-
-    print('Website URL        = %s' % webproperty.get('websiteUrl'))
-    print('Created            = %s' % webproperty.get('created'))
-    print('Updated            = %s' % webproperty.get('updated'))
-
-    print('Self Link          = %s' % webproperty.get('selfLink'))
-    parent_link = webproperty.get('parentLink')
-    print('Parent link href   = %s' % parent_link.get('href'))
-    print('Parent link type   = %s' % parent_link.get('type'))
-    child_link = webproperty.get('childLink')
-    print('Child link href    = %s' % child_link.get('href'))
-    print('Child link type    = %s' % child_link.get('type'))
+
+  found = False
+  async for webproperties_response in pages:
+    print_pagination_info(webproperties_response)
     print()
 
-  if not webproperties_response.get('items'):
+    items = webproperties_response.get('items') or []
+    for webproperty in items:
+      sys.stdout.write(
+          WEBPROPERTY_TEMPLATE.format_map(template_fields(webproperty)))
+    found = found or bool(items)
+
+  if not found:
     print('No webproperties found.\n')
 
 
-def print_profiles(profiles_response):
+async def print_profiles(pages):
   """Prints all the profile info in the Profiles Collection.
 
   Args:
-    profiles_response: The response object returned from querying the
-        Profiles collection.
+    pages: An async iterable of the response objects returned from querying
+        the Profiles collection, one per page.
   """
 
   print('------ Profiles Collection -------')
-  print_pagination_info(profiles_response)
-  print()
-
-  for profile in profiles_response.get('items', []):
-    print('Kind                      = %s' % profile.get('kind'))
-    print('Account ID                = %s' % profile.get('accountId'))
-    print('Web Property ID           = %s' % profile.get('webPropertyId'))
-    print(('Internal Web Property ID = %s' %
-           profile.get('internalWebPropertyId')))
-    print('Profile ID                = %s' % profile.get('id'))
-    print('Profile Name              = %s' % profile.get('name'))
-
-    print('Currency         = %s' % profile.get('currency'))
-    print('Timezone         = %s' % profile.get('timezone'))
-    print('Default Page     = %s' % profile.get('defaultPage'))
-
-    print(('Exclude Query Parameters        = %s' %
-           profile.get('excludeQueryParameters')))
-    print(('Site Search Category Parameters = %s' %
-           profile.get('siteSearchCategoryParameters')))
-    print(('Site Search Query Parameters    = %s' %
-           profile.get('siteSearchQueryParameters')))
-
-    print('Created          = %s' % profile.get('created'))
-    print('Updated          = %s' % profile.get('updated'))
-
-    print('Self Link        = %s' % profile.get('selfLink'))
-    parent_link = profile.get('parentLink')
-    print('Parent link href = %s' % parent_link.get('href'))
-    print('Parent link type = %s' % parent_link.get('type'))
-    child_link = profile.get('childLink')
-    print('Child link href  = %s' % child_link.get('href'))
-    print('Child link type  = %s' % child_link.get('type'))
+
+  found = False
+  async for profiles_response in pages:
+    print_pagination_info(profiles_response)
     print()
 
-  if not profiles_response.get('items'):
+    items = profiles_response.get('items') or []
+    for profile in items:
+      sys.stdout.write(PROFILE_TEMPLATE.format_map(template_fields(profile)))
+    found = found or bool(items)
+
+  if not found:
     print('No profiles found.\n')
 
 
-def print_goals(goals_response):
+async def print_goals(pages):
   """Prints all the goal info in the Goals collection.
 
   Args:
-    goals_response: The response object returned from querying the Goals
-        collection
+    pages: An async iterable of the response objects returned from querying
+        the Goals collection, one per page.
   """
 
   print('------ Goals Collection -------')
-  print_pagination_info(goals_response)
-  print()
-
-  for goal in goals_response.get('items', []):
-    print('Goal ID     = %s' % goal.get('id'))
-    print('Kind        = %s' % goal.get('kind'))
-    print('Self Link        = %s' % goal.get('selfLink'))
-
-    print('Account ID               = %s' % goal.get('accountId'))
-    print('Web Property ID          = %s' % goal.get('webPropertyId'))
-    print(('Internal Web Property ID = %s' %
-           goal.get('internalWebPropertyId')))
-    print('Profile ID               = %s' % goal.get('profileId'))
 
-    print('Goal Name   = %s' % goal.get('name'))
-    print('Goal Value  = %s' % goal.get('value'))
-    print('Goal Active = %s' % goal.get('active'))
-    print('Goal Type   = %s' % goal.get('type'))
-
-    print('Created     = %s' % goal.get('created'))
-    print('Updated     = %s' % goal.get('updated'))
-
-    parent_link = goal.get('parentLink')
-    print('Parent link href = %s' % parent_link.get('href'))
-    print('Parent link type = %s' % parent_link.get('type'))
-
-    # Print the goal details depending on the type of goal.
-    if goal.get('urlDestinationDetails'):
-      print_url_destination_goal_details(
-          goal.get('urlDestinationDetails'))
-
-    elif goal.get('visitTimeOnSiteDetails'):
-      print_visit_time_on_site_goal_details(
-          goal.get('visitTimeOnSiteDetails'))
+  found = False
+  async for goals_response in pages:
+    print_pagination_info(goals_response)
+    print()
 
-    elif goal.get('visitNumPagesDetails'):
-      print_visit_num_pages_goal_details(
-          goal.get('visitNumPagesDetails'))
+    items = goals_response.get('items') or []
+    for goal in items:
+      sys.stdout.write(GOAL_TEMPLATE.format_map(template_fields(goal)))
 
-    elif goal.get('eventDetails'):
-      print_event_goal_details(goal.get('eventDetails'))
+      # Print the goal details depending on the type of goal.
+      for details_key, print_details in GOAL_DETAILS_PRINTERS.items():
+        details = goal.get(details_key)
+        if details:
+          print_details(details)
+          break
 
-    print()
+      print()
+    found = found or bool(items)
 
-  if not goals_response.get('items'):
+  if not found:
     print('No goals found.\n')
 
 
@@ -309,20 +834,16 @@ def print_url_destination_goal_details(goal_details):
     goal_details: The details portion of the goal response.
   """
 
-  print('------ Url Destination Goal -------')
-  print('Goal URL            = %s' % goal_details.get('url'))
-  print('Case Sensitive      = %s' % goal_details.get('caseSensitive'))
-  print('Match Type          = %s' % goal_details.get('matchType'))
-  print('First Step Required = %s' % goal_details.get('firstStepRequired'))
+  parts = [URL_DESTINATION_GOAL_TEMPLATE.format_map(
+      TemplateFields(goal_details))]
+  steps = goal_details.get('steps') or []
+  for goal_step in steps:
+    parts.append(GOAL_STEP_TEMPLATE.format_map(TemplateFields(goal_step)))
 
-  print('------ Url Destination Goal Steps -------')
-  for goal_step in goal_details.get('steps', []):
-    print('Step Number  = %s' % goal_step.get('number'))
-    print('Step Name    = %s' % goal_step.get('name'))
-    print('Step URL     = %s' % goal_step.get('url'))
+  if not steps:
+    parts.append('No Steps Configured\n')
 
-  if not goal_details.get('steps'):
-    print('No Steps Configured')
+  sys.stdout.write(''.join(parts))
 
 
 def print_visit_time_on_site_goal_details(goal_details):
@@ -332,9 +853,8 @@ def print_visit_time_on_site_goal_details(goal_details):
     goal_details: The details portion of the goal response.
   """
 
-  print('------ Visit Time On Site Goal -------')
-  print('Comparison Type  = %s' % goal_details.get('comparisonType'))
-  print('comparison Value = %s' % goal_details.get('comparisonValue'))
+  sys.stdout.write(VISIT_TIME_ON_SITE_GOAL_TEMPLATE.format_map(
+      TemplateFields(goal_details)))
 
 
 def print_visit_num_pages_goal_details(goal_details):
@@ -344,9 +864,8 @@ def print_visit_num_pages_goal_details(goal_details):
     goal_details: The details portion of the goal response.
   """
 
-  print('------ Visit Num Pages Goal -------')
-  print('Comparison Type  = %s' % goal_details.get('comparisonType'))
-  print('comparison Value = %s' % goal_details.get('comparisonValue'))
+  sys.stdout.write(VISIT_NUM_PAGES_GOAL_TEMPLATE.format_map(
+      TemplateFields(goal_details)))
 
 
 def print_event_goal_details(goal_details):
@@ -356,43 +875,45 @@ def print_event_goal_details(goal_details):
     goal_details: The details portion of the goal response.
   """
 
-  print('------ Event Goal -------')
-  print('Use Event Value  = %s' % goal_details.get('useEventValue'))
-
-  for event_condition in goal_details.get('eventConditions', []):
-    event_type = event_condition.get('type')
-    print('Type             = %s' % event_type)
+  parts = [EVENT_GOAL_TEMPLATE.format_map(TemplateFields(goal_details))]
 
-    if event_type in ('CATEGORY', 'ACTION', 'LABEL'):
-      print('Match Type       = %s' % event_condition.get('matchType'))
-      print('Expression       = %s' % event_condition.get('expression'))
+  for event_condition in goal_details.get('eventConditions') or []:
+    if event_condition.get('type') in ('CATEGORY', 'ACTION', 'LABEL'):
+      template = EVENT_CONDITION_MATCH_TEMPLATE
     else:  # VALUE type.
-      print('Comparison Type  = %s' % event_condition.get('comparisonType'))
-      print('Comparison Value = %s' % event_condition.get('comparisonValue'))
+      template = EVENT_CONDITION_VALUE_TEMPLATE
+    parts.append(template.format_map(TemplateFields(event_condition)))
+
+  sys.stdout.write(''.join(parts))
+
+
+# Maps the details field of each goal type to the function that prints it. A
+# goal only has one of these fields; they are checked in this order.
+GOAL_DETAILS_PRINTERS = {
+    'urlDestinationDetails': print_url_destination_goal_details,
+    'visitTimeOnSiteDetails': print_visit_time_on_site_goal_details,
+    'visitNumPagesDetails': print_visit_num_pages_goal_details,
+    'eventDetails': print_event_goal_details,
+}
 
 
-def print_segments(segments_response):
+async def print_segments(pages):
   """Prints all the segment info in the Segments collection.
 
   Args:
-    segments_response: The response object returned from querying the
-        Segments collection.
+    pages: An async iterable of the response objects returned from querying
+        the Segments collection, one per page.
   """
 
   print('------ Segments Collection -------')
-  print_pagination_info(segments_response)
-  print()
-
-  for segment in segments_response.get('items', []):
-    print('Segment ID = %s' % segment.get('id'))
-    print('Kind       = %s' % segment.get('kind'))
-    print('Self Link  = %s' % segment.get('selfLink'))
-    print('Name       = %s' % segment.get('name'))
-    print('Definition = %s' % segment.get('definition'))
-    print('Created    = %s' % segment.get('created'))
-    print('Updated    = %s' % segment.get('updated'))
+
+  async for segments_response in pages:
+    print_pagination_info(segments_response)
     print()
 
+    for segment in segments_response.get('items') or []:
+      sys.stdout.write(SEGMENT_TEMPLATE.format_map(TemplateFields(segment)))
+
 
 def print_pagination_info(management_response):
   """Prints common pagination details.
@@ -402,17 +923,32 @@ def print_pagination_info(management_response):
         Management API.
   """
 
-  print('Items per page = %s' % management_response.get('itemsPerPage'))
-  print('Total Results  = %s' % management_response.get('totalResults'))
-  print('Start Index    = %s' % management_response.get('startIndex'))
+  get = management_response.get
+  lines = [
+      'Items per page = %s' % get('itemsPerPage'),
+      'Total Results  = %s' % get('totalResults'),
+      'Start Index    = %s' % get('startIndex')]
 
   # These only have values if other result pages exist.
-  if management_response.get('previousLink'):
-    print('Previous Link  = %s' % management_response.get('previousLink'))
-  if management_response.get('nextLink'):
-    print('Next Link      = %s' % management_response.get('nextLink'))
+  previous_link = get('previousLink')
+  if previous_link:
+    lines.append('Previous Link  = %s' % previous_link)
+  next_link = get('nextLink')
+  if next_link:
+    lines.append('Next Link      = %s' % next_link)
+
+  write_lines(lines)
+
+
+def write_lines(lines):
+  """Writes lines to stdout with a single call instead of one print per line.
+
+  Args:
+    lines: A list of strings, each written followed by a newline.
+  """
+
+  sys.stdout.write('\n'.join(lines) + '\n')
 
 
 if __name__ == '__main__':
   main(sys.argv)
-
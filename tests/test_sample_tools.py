@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+#
+# Copyright 2014 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Sample tools tests
+
+Unit tests for the googleapiclient.sample_tools module.
+"""
+from __future__ import absolute_import
+
+import os
+
+import unittest2 as unittest
+import mock
+
+from googleapiclient import sample_tools
+from googleapiclient.model import JsonModel
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+
+def datafile(filename):
+    return os.path.join(DATA_DIR, filename)
+
+
+class TestInit(unittest.TestCase):
+    def setUp(self):
+        self.credentials = mock.Mock(invalid=False)
+
+        flow_patcher = mock.patch("oauth2client.client.flow_from_clientsecrets")
+        flow_patcher.start()
+        self.addCleanup(flow_patcher.stop)
+
+        storage_patcher = mock.patch("oauth2client.file.Storage")
+        storage = storage_patcher.start()
+        self.addCleanup(storage_patcher.stop)
+        storage.return_value.get.return_value = self.credentials
+
+    def test_model_passed_to_build(self):
+        model = JsonModel()
+        with mock.patch("googleapiclient.discovery.build") as build:
+            service, flags = sample_tools.init(
+                ["sample"],
+                "plus",
+                "v1",
+                "",
+                datafile("client_secrets.json"),
+                model=model,
+            )
+
+        self.assertEqual(build.return_value, service)
+        build.assert_called_once_with(
+            "plus", "v1", http=self.credentials.authorize.return_value, model=model
+        )
+
+    def test_model_passed_to_build_from_document(self):
+        model = JsonModel()
+        service, flags = sample_tools.init(
+            ["sample"],
+            "plus",
+            "v1",
+            "",
+            datafile("client_secrets.json"),
+            discovery_filename=datafile("plus.json"),
+            model=model,
+        )
+
+        self.assertEqual(model, service._model)
+
+    def test_default_model(self):
+        service, flags = sample_tools.init(
+            ["sample"],
+            "plus",
+            "v1",
+            "",
+            datafile("client_secrets.json"),
+            discovery_filename=datafile("plus.json"),
+        )
+
+        self.assertIsInstance(service._model, JsonModel)
+
+
+if __name__ == "__main__":
+    unittest.main()